@@ -8,15 +8,17 @@ Run with --connect <host_ip> to *join* an existing board:
 """
 
 import argparse
-import colorsys
-import json
-import queue
+import itertools
+import logging
+import selectors
 import socket
+import struct
+import sys
 import threading
 import time
 import tkinter as tk
 from enum import Enum, auto
-from typing import Callable, List
+from typing import Callable, Iterable, Iterator, List
 from collections import deque
 
 # ---------------------------------------------------------------------------
@@ -27,6 +29,13 @@ SIZE = 32          # canvas is SIZE × SIZE pixels
 PIX  = 14          # each pixel's on-screen square size (px)
 PORT = 7007        # default TCP porta
 PALETTE_SIZE = 32  # palette grid 32 × 32 → occupies same visual area
+SNDBUF = 1 << 18   # kernel send buffer per peer socket (bytes)
+RECV_BUF = 1 << 16 # receive buffer per connection (bytes)
+MAX_BACKLOG = 1 << 20  # host drops a client with this many unsent bytes queued
+FLUSH_DELAY = 0.01 # seconds outgoing pixels are coalesced before sending
+PUMP_MS = 16       # GUI applies network updates once per frame (~60 Hz)
+
+log = logging.getLogger("pixboard")
 
 # ---------------------------------------------------------------------------
 # Tool selector
@@ -41,46 +50,266 @@ class ToolMode(Enum):
 # Local IP helper
 # ---------------------------------------------------------------------------
 
-def local_ip():
-    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-        s.connect(("8.8.8.8", 80))
-        return s.getsockname()[0]
+_local_ip: str | None = None
+
+
+def local_ip() -> str:
+    """This machine's LAN address; looked up once, then cached."""
+    global _local_ip
+    if _local_ip is None:
+        try:
+            # Connecting a UDP socket only picks a route: nothing is sent.
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                s.connect(("8.8.8.8", 80))
+                _local_ip = s.getsockname()[0]
+        except OSError:
+            # No default route (e.g. offline LAN): ask the resolver instead.
+            try:
+                _local_ip = socket.gethostbyname(socket.gethostname())
+            except OSError:
+                _local_ip = "127.0.0.1"
+    return _local_ip
 
 # ---------------------------------------------------------------------------
 # Palette generation
 # ---------------------------------------------------------------------------
 
-def generate_palette() -> List[str]:
-    
+def _hls_channel(m1: float, m2: float, hue: float) -> int:
+    hue %= 1.0
+    if hue < 1.0 / 6.0:
+        v = m1 + (m2 - m1) * hue * 6.0
+    elif hue < 0.5:
+        v = m2
+    elif hue < 2.0 / 3.0:
+        v = m1 + (m2 - m1) * (2.0 / 3.0 - hue) * 6.0
+    else:
+        v = m1
+    return int(v * 255)
+
+
+def generate_palette() -> tuple[str, ...]:
+    # Same maths as colorsys.hls_to_rgb(h, l, 1.0), with the lightness terms
+    # hoisted per row and the hue offsets per column.
+    hues = [(h + 1.0 / 3.0, h, h - 1.0 / 3.0)
+            for h in (x / PALETTE_SIZE for x in range(PALETTE_SIZE))]
     colors: List[str] = []
     for y in range(PALETTE_SIZE):
         l = 0.9 - 0.8 * (y / (PALETTE_SIZE - 1))
-        for x in range(PALETTE_SIZE):
+        # Not a typo: colorsys' l + s - l*s with s=1, kept for identical floats.
+        m2 = l * 2.0 if l <= 0.5 else l + 1.0 - l
+        m1 = 2.0 * l - m2
+        for x, (hr, hg, hb) in enumerate(hues):
             if x == 0 and y == 0:
                 colors.append("")
                 continue
-            h = x / PALETTE_SIZE
-            r, g, b = colorsys.hls_to_rgb(h, l, 1.0)
-            colors.append(f"#{int(r*255):02X}{int(g*255):02X}{int(b*255):02X}")
+            r, g, b = _hls_channel(m1, m2, hr), _hls_channel(m1, m2, hg), _hls_channel(m1, m2, hb)
+            colors.append(f"#{r:02X}{g:02X}{b:02X}")
 
     # Add grayscale row
     for x in range(PALETTE_SIZE):
         g = int((x / (PALETTE_SIZE - 1)) * 255)
         colors.append(f"#{g:02X}{g:02X}{g:02X}")
-    return colors
+    return tuple(colors)
+
+
+def invert_color(hex_color: str) -> str:
+    if not hex_color:
+        return "#000000"
+    r = 255 - int(hex_color[1:3], 16)
+    g = 255 - int(hex_color[3:5], 16)
+    b = 255 - int(hex_color[5:7], 16)
+    return f"#{r:02X}{g:02X}{b:02X}"
 
 
 PALETTE_COLORS = generate_palette()
+PALETTE_INVERTED = tuple(invert_color(c) for c in PALETTE_COLORS)  # highlight outline per swatch
+
+# ---------------------------------------------------------------------------
+# Wire format
+# ---------------------------------------------------------------------------
+#
+# Every frame starts with a 6-byte header whose first byte is a tag.
+# Pixel frames fit entirely in the header: [tag, x, y, r, g, b].
+# Blob frames are [tag, pad, u32 length] followed by `length` bytes:
+#   snapshot: SIZE*SIZE RGB triplets in row-major order
+#   batch:    any number of 5-byte [x, y, r, g, b] pixel records
+
+TAG_PX    = 1
+TAG_SNAP  = 2
+TAG_BATCH = 3
+BLOB_TAGS = (TAG_SNAP, TAG_BATCH)
+
+PX_FMT     = struct.Struct("!BBBBBB")
+PX_REC     = struct.Struct("!BBBBB")
+MAX_BLOB   = SIZE * SIZE * PX_REC.size  # a batch touching every cell, the largest legal blob
+BLOB_HDR   = struct.Struct("!BxI")
+FRAME_SIZE = PX_FMT.size  # == BLOB_HDR.size
+
+# Transparent ("") has no RGB value of its own, so it travels as a colour
+# the palette never produces.
+TRANSPARENT_RGB = b"\x00\x00\x01"
+
+
+def color_to_rgb(color: str) -> bytes:
+    """3-byte RGB for ``#RRGGBB`` (or ``""``), memoized per distinct colour."""
+    rgb = _COLOR_TO_RGB.get(color)
+    if rgb is None:
+        rgb = int(color[1:], 16).to_bytes(3, "big")
+        if len(_COLOR_TO_RGB) < RGB_CACHE_MAX:
+            _COLOR_TO_RGB[color] = rgb
+    return rgb
+
+
+def rgb_to_color(rgb: bytes) -> str:
+    """``#RRGGBB`` for a 3-byte ``bytes`` value, memoized per distinct colour."""
+    color = _RGB_TO_COLOR.get(rgb)
+    if color is None:
+        color = f"#{rgb[0]:02X}{rgb[1]:02X}{rgb[2]:02X}"
+        if len(_RGB_TO_COLOR) < RGB_CACHE_MAX:
+            _RGB_TO_COLOR[rgb] = color
+    return color
+
+
+# Boards only ever hold a few hundred distinct colours, nearly all from the
+# palette, so both caches hit close to 100%; the cap keeps a peer streaming
+# arbitrary colours from growing them without bound.
+RGB_CACHE_MAX = 4096
+_COLOR_TO_RGB: dict[str, bytes] = {"": TRANSPARENT_RGB}
+_COLOR_TO_RGB.update((c, int(c[1:], 16).to_bytes(3, "big")) for c in PALETTE_COLORS if c)
+_RGB_TO_COLOR: dict[bytes, str] = {rgb: c for c, rgb in _COLOR_TO_RGB.items()}
+
+
+def pack_updates(pixels: dict[tuple[int, int], str]) -> bytes:
+    """One pixel frame for a single update, one batch frame otherwise."""
+    if len(pixels) == 1:
+        ((x, y), color), = pixels.items()
+        return PX_FMT.pack(TAG_PX, x, y, *color_to_rgb(color))
+    body = b"".join(PX_REC.pack(x, y, *color_to_rgb(c)) for (x, y), c in pixels.items())
+    return BLOB_HDR.pack(TAG_BATCH, len(body)) + body
+
+
+def iter_rgb(frame: bytes) -> Iterator[tuple[int, int, bytes]]:
+    """Yield ``(x, y, rgb)`` for every on-board update in a pixel or batch frame."""
+    if frame[0] == TAG_PX:
+        records = (1,)  # the record right after the tag byte
+    else:
+        records = range(FRAME_SIZE, len(frame) - PX_REC.size + 1, PX_REC.size)
+    for i in records:
+        x, y = frame[i], frame[i + 1]
+        if x < SIZE and y < SIZE:
+            yield x, y, frame[i + 2:i + 5]
+
+
+def iter_px(frame: bytes) -> Iterator[tuple[int, int, str]]:
+    """Yield ``(x, y, color)`` for every on-board update in a pixel or batch frame."""
+    for x, y, rgb in iter_rgb(frame):
+        yield x, y, rgb_to_color(rgb)
+
+
+def sanitize_updates(frame: bytes) -> bytes | None:
+    """*frame* if every record in it is well-formed and on the board;
+    otherwise a batch of just the usable records, or None if there are none.
+    """
+    records = list(iter_rgb(frame))
+    if not records:
+        return None
+    if frame[0] == TAG_PX or len(frame) - FRAME_SIZE == len(records) * PX_REC.size:
+        return frame
+    body = b"".join(PX_REC.pack(x, y, *rgb) for x, y, rgb in records)
+    return BLOB_HDR.pack(TAG_BATCH, len(body)) + body
+
+
+def new_board() -> bytearray:
+    """Flat row-major RGB board, every cell transparent."""
+    return bytearray(TRANSPARENT_RGB * (SIZE * SIZE))
+
+
+def pack_snapshot(board: bytearray) -> tuple[bytes, bytes]:
+    """Header and body of a snapshot frame, kept apart for scatter/gather sends."""
+    return BLOB_HDR.pack(TAG_SNAP, len(board)), bytes(board)
+
+
+def unpack_snapshot(snap: bytes) -> List[str]:
+    """Colour of every cell in a snapshot body, flat and row-major."""
+    return [rgb_to_color(snap[i:i + 3]) for i in range(0, SIZE * SIZE * 3, 3)]
 
 # ---------------------------------------------------------------------------
 # Network layer (host ↔ client)
 # ---------------------------------------------------------------------------
 
+class _FrameReader:
+    """Splits a socket's byte stream into frames without per-read allocations.
+
+    recv_into() lands bytes straight in one preallocated buffer; the
+    unconsumed tail is moved to the front only once the buffer is full.
+    """
+
+    def __init__(self, sock: socket.socket, size: int = RECV_BUF) -> None:
+        self.sock = sock
+        self.buf = bytearray(size)
+        self.view = memoryview(self.buf)
+        self.start = 0  # first byte not yet returned as a frame
+        self.end = 0    # one past the last byte received
+
+    def recv(self) -> int:
+        """Read whatever the socket has; returns the byte count (0 on EOF)."""
+        if self.end == len(self.buf):
+            tail = bytes(self.view[self.start:self.end])
+            self.buf[:len(tail)] = tail
+            self.start, self.end = 0, len(tail)
+        n = self.sock.recv_into(self.view[self.end:])
+        self.end += n
+        return n
+
+    def pop_frames(self) -> List[bytes]:
+        """Return every complete frame received so far."""
+        frames: List[bytes] = []
+        buf, pos = self.buf, self.start
+        while self.end - pos >= FRAME_SIZE:
+            end = pos + FRAME_SIZE
+            if buf[pos] in BLOB_TAGS:
+                length = BLOB_HDR.unpack_from(buf, pos)[1]
+                if length > MAX_BLOB:
+                    raise ConnectionError("oversized frame")
+                end += length
+                if end > self.end:
+                    break
+            frames.append(bytes(self.view[pos:end]))
+            pos = end
+        if pos == self.end:
+            pos = self.end = 0  # drained: next read starts at the front again
+        self.start = pos
+        return frames
+
+
+# Queued frames go out in one writev-style sendmsg() where available
+# (not on Windows); IOV_MAX caps how many buffers one call takes.
+HAS_SENDMSG = hasattr(socket.socket, "sendmsg")
+IOV_MAX     = 64
+
+
+class _HostConn:
+    """Host-side state of one client connection."""
+
+    def __init__(self, sock: socket.socket, ip: str) -> None:
+        self.sock = sock
+        self.ip = ip
+        self.reader = _FrameReader(sock)
+        self.out: deque[bytes | memoryview] = deque()  # buffers waiting for the socket
+        self.queued = 0           # total bytes in `out`
+        self.closed = False
+
+
 class NetPeer:
     def __init__(self, listen: bool, host_addr: str | None, port: int, on_px: Callable[[int, int, str], None]):
         self.on_px = on_px
-        self.q_out = queue.Queue()
-        self.keepalive_interval = 3
+        self.on_snapshot: Callable[[bytes], None] = lambda snap: None
+        # Outgoing pixels, last write wins: never more than SIZE*SIZE entries,
+        # however far the network falls behind.
+        self._pending: dict[tuple[int, int], str] = {}
+        self._pending_lock = threading.Lock()
+        self._pending_event = threading.Event()
+        self._wake: Callable[[], None] = lambda: None
         self.active = True
 
         if listen:
@@ -89,139 +318,292 @@ class NetPeer:
             threading.Thread(target=self._client_loop, args=(host_addr, port), daemon=True).start()
 
     @staticmethod
-    def _recv_json(sock, buffer: bytearray) -> dict:
-        while b"\n" not in buffer:
-            chunk = sock.recv(4096)
-            if not chunk:
-                raise ConnectionError("peer closed")
-            buffer.extend(chunk)
-        line_end = buffer.index(b"\n")
-        line = buffer[:line_end]
-        del buffer[:line_end + 1]
-        return json.loads(line.decode())
-
-
-    @staticmethod
-    def _send_json(sock, obj):
-        msg = json.dumps(obj) + "\n"
-        sock.sendall(msg.encode())
+    def _tune_socket(sock: socket.socket) -> None:
+        # Frames are tiny and latency-bound: never let Nagle hold them back.
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, SNDBUF)
+        # Dead peers are detected by the kernel: probe after 10 s idle,
+        # every 3 s, give up after 3 misses (where the OS lets us tune it).
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for opt, value in (("TCP_KEEPIDLE", 10), ("TCP_KEEPINTVL", 3), ("TCP_KEEPCNT", 3)):
+            if hasattr(socket, opt):
+                sock.setsockopt(socket.IPPROTO_TCP, getattr(socket, opt), value)
 
     def send_px(self, x, y, color):
-        self.q_out.put({"x": x, "y": y, "c": color})
+        self.send_batch(((x, y, color),))
+
+    def send_batch(self, pixels: Iterable[tuple[int, int, str]]):
+        """Queue many pixels under one lock acquisition (e.g. a flood fill)."""
+        with self._pending_lock:
+            was_idle = not self._pending
+            for x, y, color in pixels:
+                self._pending[(x, y)] = color
+            first = was_idle and bool(self._pending)
+        if first:
+            self._pending_event.set()
+            self._wake()
+
+    def _take_pending(self) -> bytes | None:
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            self._pending_event.clear()
+        return pack_updates(pending) if pending else None
+
+    def _next_frame(self, timeout: float | None = None) -> bytes | None:
+        """Wait for the first pixel of a burst, give the rest of the burst
+        FLUSH_DELAY to arrive, then take it all as one frame.
+
+        Returns None if *timeout* expires with nothing pending.
+        """
+        if not self._pending_event.wait(timeout):
+            return None
+        time.sleep(FLUSH_DELAY)
+        return self._take_pending()
 
     def _host_loop(self, port):
-        board = [[""] * SIZE for _ in range(SIZE)]
-        clients: dict[str, socket.socket] = {}
-        lock = threading.Lock()
+        # Single-threaded: every socket is non-blocking and multiplexed by
+        # one selector; local pixels wake it through a socketpair.
+        board = new_board()
+        clients: dict[str, _HostConn] = {}
+        snap_cache: tuple[bytes, bytes] = (b"", b"")
+        snap_dirty = True
+        flush_at: float | None = None
+        sel = selectors.DefaultSelector()
+
+        wake_r, wake_w = socket.socketpair()
+        wake_r.setblocking(False)
+        wake_w.setblocking(False)
+
+        def wake():
+            try:
+                wake_w.send(b"\0")
+            except BlockingIOError:
+                pass  # a wake-up is already queued
+
+        def apply(frame: bytes):
+            nonlocal snap_dirty
+            for x, y, rgb in iter_rgb(frame):
+                i = (y * SIZE + x) * 3
+                board[i:i + 3] = rgb
+                self.on_px(x, y, rgb_to_color(rgb))
+            snap_dirty = True
+
+        def snapshot() -> tuple[bytes, bytes]:
+            # Rebuilt only when the board changed since the last join.
+            nonlocal snap_cache, snap_dirty
+            if snap_dirty:
+                snap_dirty = False
+                snap_cache = pack_snapshot(board)
+            return snap_cache
+
+        def drop(c: _HostConn, reason):
+            if c.closed:
+                return
+            c.closed = True
+            sel.unregister(c.sock)
+            c.sock.close()
+            log.info("[Host] Disconnected: %s: %s", c.ip, reason)
+            if clients.get(c.ip) is c:
+                del clients[c.ip]
+                log.info("[Host] Client %s removed.", c.ip)
+
+        def send(c: _HostConn, *bufs: bytes):
+            # Buffers are queued by reference: one broadcast frame is shared
+            # by every peer and only ever copied by the kernel.
+            if not c.out:
+                sel.modify(c.sock, selectors.EVENT_READ | selectors.EVENT_WRITE, c)
+            for buf in bufs:
+                c.out.append(buf)
+                c.queued += len(buf)
+            if c.queued > MAX_BACKLOG:
+                drop(c, "not reading, send backlog full")
+
+        def broadcast(frame: bytes):
+            for c in list(clients.values()):
+                send(c, frame)
+
+        def accept():
+            # A failed accept must not take the loop (and every client) down.
+            try:
+                sock, addr = srv.accept()
+            except OSError as e:
+                if not isinstance(e, BlockingIOError):
+                    log.warning("[Host] Accept failed: %s", e)
+                return
+            try:
+                sock.setblocking(False)
+                self._tune_socket(sock)
+            except OSError as e:
+                log.warning("[Host] Dropping %s during setup: %s", addr[0], e)
+                sock.close()
+                return
+            c = _HostConn(sock, addr[0])
+            old = clients.pop(c.ip, None)
+            clients[c.ip] = c
+            if old is not None:
+                log.info("[Host] Replacing existing connection from %s", c.ip)
+                drop(old, "replaced")
+            log.info("[Host] Client connected: %s", c.ip)
+            sel.register(sock, selectors.EVENT_READ, c)
+            send(c, *snapshot())
+
+        def read(c: _HostConn):
+            try:
+                received = c.reader.recv()
+            except BlockingIOError:
+                return
+            except OSError as e:
+                drop(c, e)
+                return
+            if not received:
+                drop(c, "peer closed")
+                return
+            try:
+                frames = c.reader.pop_frames()
+            except ConnectionError as e:
+                drop(c, e)
+                return
+            for frame in frames:
+                if frame[0] not in (TAG_PX, TAG_BATCH):
+                    continue
+                # Relay only what was applied, never a peer's raw junk.
+                frame = sanitize_updates(frame)
+                if frame:
+                    apply(frame)
+                    broadcast(frame)
 
-        def handle_client(conn, addr):
-            ip = addr[0]
+        def write(c: _HostConn):
             try:
-                buffer = bytearray()
-                self._send_json(conn, {"snapshot": board})
-                while True:
-                    msg = self._recv_json(conn, buffer)
-                    if msg.get("noop"):
-                        print(f"[Host] NOOP (Keep-alive) from {ip}")
-                        self._send_json(conn, {"ack": "noop"})
-                        continue
-
-                    if "x" in msg:
-                        x, y, c = msg["x"], msg["y"], msg["c"]
-                        board[y][x] = c
-                        self.on_px(x, y, c)
-                        with lock:
-                            for p in clients.values():
-                                try:
-                                    self._send_json(p, msg)
-                                except:
-                                    pass
-            except Exception as e:
-                print(f"[Host] Disconnected: {ip}: {e}")
-            finally:
-                conn.close()
-                with lock:
-                    if ip in clients and clients[ip] == conn:
-                        del clients[ip]
-                        print(f"[Host] Client {ip} removed.")
-
-        def forward_host_events():
-            while True:
-                msg = self.q_out.get()
-                x, y, c = msg["x"], msg["y"], msg["c"]
-                board[y][x] = c
-                self.on_px(x, y, c)
-                with lock:
-                    for p in clients.values():
-                        try:
-                            self._send_json(p, msg)
-                        except:
-                            pass
-
-        threading.Thread(target=forward_host_events, daemon=True).start()
+                if HAS_SENDMSG:
+                    sent = c.sock.sendmsg(list(itertools.islice(c.out, IOV_MAX)))
+                else:
+                    sent = c.sock.send(c.out[0])
+            except BlockingIOError:
+                return
+            except OSError as e:
+                drop(c, e)
+                return
+            c.queued -= sent
+            while sent:
+                head = c.out[0]
+                if sent < len(head):
+                    c.out[0] = memoryview(head)[sent:]
+                    break
+                sent -= len(head)
+                c.out.popleft()
+            if not c.out:
+                sel.modify(c.sock, selectors.EVENT_READ, c)
+
         srv = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         srv.bind(("", port))
         srv.listen()
-        print(f"[Host] Listening on {local_ip()}:{port}")
+        srv.setblocking(False)
+        sel.register(srv, selectors.EVENT_READ)
+        sel.register(wake_r, selectors.EVENT_READ)
+        self._wake = wake
+        # Pixels queued before the hook was installed only called the no-op
+        # placeholder, and later ones won't wake us while they are pending.
+        if self._pending:
+            wake()
+        log.info("[Host] Listening on %s:%d", local_ip(), port)
 
         while True:
-            conn, addr = srv.accept()
-            ip = addr[0]
-            with lock:
-                if ip in clients:
-                    try:
-                        clients[ip].close()
-                    except:
-                        pass
-                    print(f"[Host] Replacing existing connection from {ip}")
-                clients[ip] = conn
-            print(f"[Host] Client connected: {ip}")
-            threading.Thread(target=handle_client, args=(conn, addr), daemon=True).start()
+            timeout = None if flush_at is None else max(0.0, flush_at - time.monotonic())
+            for key, mask in sel.select(timeout):
+                if key.fileobj is srv:
+                    accept()
+                elif key.fileobj is wake_r:
+                    wake_r.recv(4096)
+                    if flush_at is None:
+                        flush_at = time.monotonic() + FLUSH_DELAY
+                else:
+                    c = key.data
+                    if mask & selectors.EVENT_READ:
+                        read(c)
+                    if mask & selectors.EVENT_WRITE and not c.closed:
+                        write(c)
+            if flush_at is not None and time.monotonic() >= flush_at:
+                flush_at = None
+                frame = self._take_pending()
+                if frame:
+                    apply(frame)
+                    broadcast(frame)
 
     def _client_loop(self, host, port):
-        buffer = bytearray()
         def sender(sock):
             while self.active:
-                try:
-                    msg = self.q_out.get(timeout=1)
-                    self._send_json(sock, msg)
-                except queue.Empty:
+                frame = self._next_frame(timeout=1)
+                if not frame:
                     continue
-                except Exception as e:
-                    print(f"[Client] Sender error: {e}")
-                    break
-
-        def keep_alive(sock):
-            while self.active:
                 try:
-                    time.sleep(self.keepalive_interval)
-                    self._send_json(sock, {"noop": 1})
+                    sock.sendall(frame)
                 except Exception as e:
-                    print(f"[Client] Keep-alive error: {e}")
+                    log.warning("[Client] Sender error: %s", e)
                     break
 
         try:
             s = socket.create_connection((host, port), timeout=10)
-            print(f"[Client] Connected to {host}:{port}")
+            s.settimeout(None)  # the timeout only bounds the connect; idle boards are fine
+            self._tune_socket(s)
+            log.info("[Client] Connected to %s:%d", host, port)
             threading.Thread(target=sender, args=(s,), daemon=True).start()
-            threading.Thread(target=keep_alive, args=(s,), daemon=True).start()
+            reader = _FrameReader(s)
             while True:
-                msg = self._recv_json(s, buffer)
-                if "snapshot" in msg:
-                    snap = msg["snapshot"]
-                    for y in range(SIZE):
-                        for x in range(SIZE):
-                            self.on_px(x, y, snap[y][x])
-                elif "x" in msg:
-                    self.on_px(msg["x"], msg["y"], msg["c"])
-                elif "ack" in msg:
-                    if msg["ack"] == "noop":
-                        print(f"[Client] Keep-alive ACK received")
+                if not reader.recv():
+                    raise ConnectionError("peer closed")
+                for frame in reader.pop_frames():
+                    tag = frame[0]
+                    if tag == TAG_SNAP:
+                        self.on_snapshot(frame[FRAME_SIZE:])
+                    elif tag in (TAG_PX, TAG_BATCH):
+                        for x, y, c in iter_px(frame):
+                            self.on_px(x, y, c)
         except Exception as e:
-            print(f"[Client] Disconnected or error: {e}")
+            log.warning("[Client] Disconnected or error: %s", e)
 
 
+# ---------------------------------------------------------------------------
+# Flood fill
+# ---------------------------------------------------------------------------
+
+def flood_region(board: List[str], x: int, y: int) -> List[tuple[int, int]]:
+    """Scanline fill: every cell 4-connected to (x, y) sharing its colour.
+
+    *board* is flat and row-major: cell (x, y) lives at ``y * SIZE + x``.
+    """
+    target = board[y * SIZE + x]
+    seen = bytearray(SIZE * SIZE)
+    region: List[tuple[int, int]] = []
+    stack = [(x, y)]
+    while stack:
+        sx, sy = stack.pop()
+        base = sy * SIZE
+        if seen[base + sx]:
+            continue
+        left = right = sx
+        while left > 0 and board[base + left - 1] == target:
+            left -= 1
+        while right < SIZE - 1 and board[base + right + 1] == target:
+            right += 1
+        for cx in range(left, right + 1):
+            seen[base + cx] = 1
+            region.append((cx, sy))
+        # Seed one point per run of matching cells in the rows above and below.
+        for ny in (sy - 1, sy + 1):
+            if not 0 <= ny < SIZE:
+                continue
+            nbase = ny * SIZE
+            in_run = False
+            for cx in range(left, right + 1):
+                if board[nbase + cx] == target and not seen[nbase + cx]:
+                    if not in_run:
+                        stack.append((cx, ny))
+                    in_run = True
+                else:
+                    in_run = False
+    return region
+
 # ---------------------------------------------------------------------------
 # GUI
 # ---------------------------------------------------------------------------
@@ -240,18 +622,14 @@ class PixBoardGUI:
             self.root, width=SIZE * PIX, height=SIZE * PIX, bg="white"
         )
         self.canvas.pack(side="top")
-        self.px_ids: List[List[int]] = [[None] * SIZE for _ in range(SIZE)]
-        for y in range(SIZE):
-            for x in range(SIZE):
-                x0, y0 = x * PIX, y * PIX
-                self.px_ids[y][x] = self.canvas.create_rectangle(
-                    x0,
-                    y0,
-                    x0 + PIX,
-                    y0 + PIX,
-                    fill="",
-                    outline="#EEE",
-                )
+        # The whole board is one image; SIZE × SIZE staging copy for snapshots.
+        self.img = tk.PhotoImage(width=SIZE * PIX, height=SIZE * PIX)
+        self._stage = tk.PhotoImage(width=SIZE, height=SIZE)
+        self.canvas.create_image(0, 0, anchor="nw", image=self.img)
+        for i in range(SIZE + 1):
+            self.canvas.create_line(i * PIX, 0, i * PIX, SIZE * PIX, fill="#EEE")
+            self.canvas.create_line(0, i * PIX, SIZE * PIX, i * PIX, fill="#EEE")
+        self.board: List[str] = [""] * (SIZE * SIZE)  # mirrors the image, row-major
         self.canvas.bind("<Button-1>", self._board_click)
         self.canvas.bind("<B1-Motion>", self._board_drag)
 
@@ -272,15 +650,26 @@ class PixBoardGUI:
                 x0 + PIX,
                 y0 + PIX,
                 fill=col if col else "white",
-                outline="#DDD",
+                outline="",
             )
             if col == "":
                 self.palette_canvas.create_line(x0, y0, x0 + PIX, y0 + PIX, fill="#888")
                 self.palette_canvas.create_line(x0 + PIX, y0, x0, y0 + PIX, fill="#888")
+        # One overlay grid instead of an outline around every swatch.
+        rows = len(PALETTE_COLORS) // PALETTE_SIZE
+        for i in range(PALETTE_SIZE + 1):
+            self.palette_canvas.create_line(i * PIX, 0, i * PIX, rows * PIX, fill="#DDD")
+        for j in range(rows + 1):
+            self.palette_canvas.create_line(0, j * PIX, PALETTE_SIZE * PIX, j * PIX, fill="#DDD")
         self.palette_canvas.bind("<Button-1>", self._palette_click)
 
         self.current_color = "#000000"
-        peer.on_px = self.set_px
+        # Tk is not thread-safe: network threads decode updates and append
+        # them to this inbox; _pump applies it on the Tk thread, in order.
+        self._inbox: deque[tuple[int, int, str] | List[str]] = deque()
+        peer.on_px = lambda x, y, color: self._inbox.append((x, y, color))
+        peer.on_snapshot = lambda snap: self._inbox.append(unpack_snapshot(snap))
+        self.root.after(PUMP_MS, self._pump)
 
         self._add_toolbar()
 
@@ -301,16 +690,16 @@ class PixBoardGUI:
 
     def _set_tool(self, mode):
         self.tool_mode = mode
-        print(f"[GUI] Tool mode set to: {mode.name}")
+        log.debug("[GUI] Tool mode set to: %s", mode.name)
 
     def _board_click(self, evt):
         x, y = evt.x // PIX, evt.y // PIX
         if not (0 <= x < SIZE and 0 <= y < SIZE): return
-        print(f"[GUI] Click at ({x}, {y}) with tool {self.tool_mode.name} and color {self.current_color or 'transparent'}")
+        log.debug("[GUI] Click at (%d, %d) with tool %s and color %s",
+                  x, y, self.tool_mode.name, self.current_color or "transparent")
         if self.tool_mode == ToolMode.FILL:
             self._fill(x, y, self.current_color)
-        else:
-            self.set_px(x, y, self.current_color)
+        elif self.set_px(x, y, self.current_color):
             self.peer.send_px(x, y, self.current_color)
 
     def _board_drag(self, evt):
@@ -323,7 +712,7 @@ class PixBoardGUI:
         if 0 <= x < PALETTE_SIZE and 0 <= y < PALETTE_SIZE + 1:
             idx = y * PALETTE_SIZE + x
             self.current_color = PALETTE_COLORS[idx]
-            print(f"[GUI] Color selected: {self.current_color or 'transparent'}")
+            log.debug("[GUI] Color selected: %s", self.current_color or "transparent")
 
             # Remove previous highlight
             if self.selected_palette_id is not None:
@@ -332,16 +721,7 @@ class PixBoardGUI:
             # Draw new highlight
             x0, y0 = x * PIX, y * PIX
             x1, y1 = x0 + PIX, y0 + PIX
-
-            def invert_color(hex_color):
-                if not hex_color:
-                    return "#000000"
-                r = 255 - int(hex_color[1:3], 16)
-                g = 255 - int(hex_color[3:5], 16)
-                b = 255 - int(hex_color[5:7], 16)
-                return f"#{r:02X}{g:02X}{b:02X}"
-
-            highlight_color = invert_color(self.current_color)
+            highlight_color = PALETTE_INVERTED[idx]
             self.selected_palette_id = self.palette_canvas.create_rectangle(
                 x0, y0, x1, y1,
                 outline=highlight_color,
@@ -349,35 +729,54 @@ class PixBoardGUI:
             )
 
 
-    def set_px(self, x: int, y: int, color: str):
-        fill = color
-        print(f"[GUI] set_px({x}, {y}, '{color}')")
-        self.canvas.itemconfigure(self.px_ids[y][x], fill=fill)
+    def set_px(self, x: int, y: int, color: str) -> bool:
+        """Paint one cell; returns False (and touches nothing) if unchanged."""
+        i = y * SIZE + x
+        if self.board[i] == color:
+            return False
+        self.board[i] = color
+        x0, y0 = x * PIX, y * PIX
+        self.img.put(color or "white", to=(x0, y0, x0 + PIX, y0 + PIX))
+        return True
+
+    def apply_snapshot(self, board: List[str]) -> None:
+        """Paint a decoded snapshot (see unpack_snapshot) with one put and
+        one zoomed copy.
+
+        A snapshot identical to what is already shown (e.g. after a quick
+        reconnect) costs no Tk calls at all.
+        """
+        if board == self.board:
+            return
+        self.board = board
+        rows = ["{" + " ".join(c or "white" for c in board[y:y + SIZE]) + "}"
+                for y in range(0, SIZE * SIZE, SIZE)]
+        self._stage.put(" ".join(rows))
+        self.img.tk.call(self.img.name, "copy", self._stage.name, "-zoom", PIX, PIX)
+
+    def _pump(self) -> None:
+        """Apply every update the network posted since the last tick."""
+        inbox = self._inbox
+        for _ in range(len(inbox)):
+            item = inbox.popleft()
+            if isinstance(item, list):
+                self.apply_snapshot(item)
+            else:
+                self.set_px(*item)
+        self.root.after(PUMP_MS, self._pump)
 
     def _fill(self, x: int, y: int, new_color: str):
-        current = self.canvas.itemcget(self.px_ids[y][x], "fill")
+        current = self.board[y * SIZE + x]
         if current == new_color:
             return
-        visited = set()
-        q = deque([(x, y)])
-        print(f"[GUI] Starting flood fill at ({x}, {y}) from '{current}' to '{new_color}'")
-        while q:
-            cx, cy = q.popleft()
-            if (cx, cy) in visited:
-                continue
-            visited.add((cx, cy))
-            if not (0 <= cx < SIZE and 0 <= cy < SIZE):
-                continue
-            item = self.px_ids[cy][cx]
-            col = self.canvas.itemcget(item, "fill")
-            if col != current:
-                continue
+        log.debug("[GUI] Starting flood fill at (%d, %d) from %r to %r", x, y, current, new_color)
+        region = flood_region(self.board, x, y)
+        for cx, cy in region:
             self.set_px(cx, cy, new_color)
-            self.peer.send_px(cx, cy, new_color)
-            q.extend([(cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)])
+        self.peer.send_batch((cx, cy, new_color) for cx, cy in region)
 
     def run(self) -> None:
-        print("[GUI] PixBoard GUI started.")
+        log.info("[GUI] PixBoard GUI started.")
         self.root.mainloop()
 
 # ---------------------------------------------------------------------------
@@ -388,7 +787,12 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("--connect", help="IP of host to join")
     parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every click")
     args = parser.parse_args()
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format="%(message)s")
+    # Hand the GIL back to the Tk thread sooner than the default 5 ms when
+    # network threads are busy, so clicks and drags stay responsive.
+    sys.setswitchinterval(0.001)
 
     peer = NetPeer(
         listen=args.connect is None,
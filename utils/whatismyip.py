@@ -1,7 +1,26 @@
 import socket
+
+_cache = None
+
 def local_ip():
-    # Crea un socket UDP “falso” hacia Internet para descubrir
-    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-        s.connect(("8.8.8.8", 80))   # no se envía nada realmente
-        return s.getsockname()[0]
+    # Se calcula una sola vez y se reutiliza en las llamadas siguientes
+    global _cache
+    if _cache is None:
+        try:
+            # Crea un socket UDP “falso” hacia Internet para descubrir
+            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+                s.connect(("8.8.8.8", 80))   # no se envía nada realmente
+                _cache = s.getsockname()[0]
+        except OSError:
+            # Sin ruta por defecto (red sin Internet): se usa el nombre del equipo
+            try:
+                _cache = socket.gethostbyname(socket.gethostname())
+            except OSError:
+                _cache = "127.0.0.1"
+    return _cache
+
+def reset_cache():
+    # Útil si cambia la red (y con ella la IP principal)
+    global _cache
+    _cache = None
 